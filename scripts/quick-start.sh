@@ -32,6 +32,14 @@ run_cmd() {
     "$@"
 }
 
+# Display command and replace this shell with it. Used for the final guest
+# launch, so that the script does not stay resident while the guest runs and
+# signals and the exit status go straight to the launched command.
+exec_cmd() {
+    echo -e "${BLUE}$@${NC}"
+    exec "$@"
+}
+
 # Check if running in AxVisor root directory
 check_root_dir() {
     if [ ! -f "Cargo.toml" ]; then
@@ -170,7 +178,7 @@ setup_qemu_aarch64() {
 
 run_qemu_aarch64_arceos() {
     info "=== Launching QEMU AArch64 ArceOS Guest ==="
-    run_cmd cargo xtask qemu \
+    exec_cmd cargo xtask qemu \
         --build-config tmp/configs/qemu-aarch64.toml \
         --qemu-config tmp/configs/qemu-aarch64-runtime.toml \
         --vmconfigs tmp/configs/arceos-aarch64-qemu-smp1.toml
@@ -178,7 +186,7 @@ run_qemu_aarch64_arceos() {
 
 run_qemu_aarch64_linux() {
     info "=== Launching QEMU AArch64 Linux Guest ==="
-    run_cmd cargo xtask qemu \
+    exec_cmd cargo xtask qemu \
         --build-config tmp/configs/qemu-aarch64.toml \
         --qemu-config tmp/configs/qemu-aarch64-runtime.toml \
         --vmconfigs tmp/configs/linux-aarch64-qemu-smp1.toml
@@ -186,7 +194,7 @@ run_qemu_aarch64_linux() {
 
 run_qemu_aarch64_multi() {
     info "=== Launching QEMU AArch64 Multiple Guests (ArceOS + Linux) ==="
-    run_cmd cargo xtask qemu \
+    exec_cmd cargo xtask qemu \
         --build-config tmp/configs/qemu-aarch64.toml \
         --qemu-config tmp/configs/qemu-aarch64-runtime.toml \
         --vmconfigs tmp/configs/arceos-aarch64-qemu-smp1.toml \
@@ -222,7 +230,7 @@ setup_qemu_x86_64() {
 
 run_qemu_x86_64_nimbos() {
     info "=== Launching QEMU x86_64 NimbOS Guest ==="
-    run_cmd cargo xtask qemu \
+    exec_cmd cargo xtask qemu \
         --build-config tmp/configs/qemu-x86_64.toml \
         --qemu-config tmp/configs/qemu-x86_64-runtime.toml \
         --vmconfigs tmp/configs/nimbos-x86_64-qemu-smp1.toml
@@ -324,7 +332,7 @@ setup_phytiumpi() {
 
 run_phytiumpi_arceos() {
     info "=== Launching Phytium Pi ArceOS Guest ==="
-    run_cmd cargo xtask uboot \
+    exec_cmd cargo xtask uboot \
         --build-config tmp/configs/phytiumpi.toml \
         --uboot-config tmp/configs/phytiumpi-runtime.toml \
         --vmconfigs tmp/configs/arceos-aarch64-e2000-smp1.toml
@@ -332,7 +340,7 @@ run_phytiumpi_arceos() {
 
 run_phytiumpi_linux() {
     info "=== Launching Phytium Pi Linux Guest ==="
-    run_cmd cargo xtask uboot \
+    exec_cmd cargo xtask uboot \
         --build-config tmp/configs/phytiumpi.toml \
         --uboot-config tmp/configs/phytiumpi-runtime.toml \
         --vmconfigs tmp/configs/linux-aarch64-e2000-smp1.toml
@@ -340,7 +348,7 @@ run_phytiumpi_linux() {
 
 run_phytiumpi_multi() {
     info "=== Launching Phytium Pi Multiple Guests (ArceOS + Linux) ==="
-    run_cmd cargo xtask uboot \
+    exec_cmd cargo xtask uboot \
         --build-config tmp/configs/phytiumpi.toml \
         --uboot-config tmp/configs/phytiumpi-runtime.toml \
         --vmconfigs tmp/configs/arceos-aarch64-e2000-smp1.toml \
@@ -444,7 +452,7 @@ setup_roc_rk3568_pc() {
 
 run_roc_rk3568_pc_arceos() {
     info "=== Launching ROC-RK3568-PC ArceOS Guest ==="
-    run_cmd cargo xtask uboot \
+    exec_cmd cargo xtask uboot \
         --build-config tmp/configs/roc-rk3568-pc.toml \
         --uboot-config tmp/configs/roc-rk3568-pc-runtime.toml \
         --vmconfigs tmp/configs/arceos-aarch64-rk3568-smp1.toml
@@ -452,7 +460,7 @@ run_roc_rk3568_pc_arceos() {
 
 run_roc_rk3568_pc_linux() {
     info "=== Launching ROC-RK3568-PC Linux Guest ==="
-    run_cmd cargo xtask uboot \
+    exec_cmd cargo xtask uboot \
         --build-config tmp/configs/roc-rk3568-pc.toml \
         --uboot-config tmp/configs/roc-rk3568-pc-runtime.toml \
         --vmconfigs tmp/configs/linux-aarch64-rk3568-smp1.toml
@@ -460,7 +468,7 @@ run_roc_rk3568_pc_linux() {
 
 run_roc_rk3568_pc_multi() {
     info "=== Launching ROC-RK3568-PC Multiple Guests (ArceOS + Linux) ==="
-    run_cmd cargo xtask uboot \
+    exec_cmd cargo xtask uboot \
         --build-config tmp/configs/roc-rk3568-pc.toml \
         --uboot-config tmp/configs/roc-rk3568-pc-runtime.toml \
         --vmconfigs tmp/configs/arceos-aarch64-rk3568-smp1.toml \
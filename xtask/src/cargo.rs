@@ -15,7 +15,7 @@
 use ostool::build::CargoRunnerKind;
 use std::{fs, path::PathBuf};
 
-use crate::ctx::Context;
+use crate::ctx::{Context, project_root};
 
 impl Context {
     pub async fn run_qemu(&mut self, config_path: Option<PathBuf>) -> anyhow::Result<()> {
@@ -32,18 +32,21 @@ impl Context {
             ));
         };
 
+        let config_name = format!("qemu-{}.toml", arch.name());
+
         let config_path = if let Some(path) = config_path {
             path
         } else {
-            PathBuf::from(format!(".qemu-{arch:?}.toml").to_lowercase())
+            project_root().join(format!(".{config_name}"))
         };
 
         // If the configuration file does not exist, copy from the default location
         if !config_path.exists() {
             fs::copy(
-                PathBuf::from("scripts")
+                project_root()
+                    .join("scripts")
                     .join("ostool")
-                    .join(format!("qemu-{arch:?}.toml").to_lowercase()),
+                    .join(&config_name),
                 &config_path,
             )?;
         }
@@ -62,7 +65,7 @@ impl Context {
     pub async fn run_uboot(&mut self, config_path: Option<PathBuf>) -> anyhow::Result<()> {
         let build_config = self.load_config()?;
 
-        let config_path = config_path.unwrap_or_else(|| PathBuf::from(".uboot.toml"));
+        let config_path = config_path.unwrap_or_else(|| project_root().join(".uboot.toml"));
 
         let kind = CargoRunnerKind::Uboot {
             uboot_config: Some(config_path),
@@ -79,3 +82,13 @@ enum Arch {
     Aarch64,
     X86_64,
 }
+
+impl Arch {
+    /// Architecture name as used in config file names
+    fn name(self) -> &'static str {
+        match self {
+            Arch::Aarch64 => "aarch64",
+            Arch::X86_64 => "x86_64",
+        }
+    }
+}
@@ -15,16 +15,46 @@
 use anyhow::{Context, Result, anyhow};
 use cargo_metadata::{MetadataCommand, Package};
 use colored::*;
+use serde::{Deserialize, Serialize};
+use sha2::{Digest, Sha256};
 use std::collections::HashSet;
-use std::process::Command;
-use std::time::Instant;
+use std::ffi::{OsStr, OsString};
+use std::fs;
+use std::io::{BufRead, BufReader, Read};
+use std::path::{Path, PathBuf};
+use std::process::{Command, Stdio};
+use std::sync::Mutex;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::thread;
+use std::time::{Instant, UNIX_EPOCH};
 
 // Import ClippyArgs from main.rs
 use super::ClippyArgs;
+use crate::ctx::project_root;
+use crate::process::shell_join;
 
 /// Static target array configuration
 const TARGETS: &[&str] = &["x86_64-unknown-none", "aarch64-unknown-none-softfloat"];
 const PACKAGE: &str = "axvisor";
+/// Cache of the workspace metadata, stored under `target/xtask/`
+const WORKSPACE_CACHE_FILE: &str = "clippy-workspace.json";
+
+/// Workspace information needed to plan clippy checks
+#[derive(Serialize, Deserialize)]
+struct WorkspaceInfo {
+    /// Hash of the inputs this was read from, see [`workspace_key`]
+    key: String,
+    target_directory: PathBuf,
+    packages: Vec<PackageInfo>,
+}
+
+/// A workspace package together with its checkable features
+#[derive(Serialize, Deserialize)]
+struct PackageInfo {
+    name: String,
+    version: String,
+    features: Vec<String>,
+}
 
 /// Clippy check result statistics
 #[derive(Debug, Default)]
@@ -82,6 +112,15 @@ impl ClippyStats {
     }
 }
 
+/// A single clippy invocation: one package checked for one target with a set of features.
+struct ClippyCheck<'a> {
+    target: &'static str,
+    package: &'a str,
+    features: Vec<String>,
+    /// Human-readable description of the feature set being checked
+    description: String,
+}
+
 /// Main clippy runner function
 pub fn run_clippy(args: ClippyArgs) -> Result<()> {
     let start_time = Instant::now();
@@ -108,16 +147,12 @@ pub fn run_clippy(args: ClippyArgs) -> Result<()> {
             .collect::<HashSet<_>>()
     });
 
-    // Get workspace metadata
-    let metadata = MetadataCommand::new()
-        .no_deps()
-        .exec()
-        .context("Failed to get workspace metadata")?;
+    let xtask_dir = xtask_dir();
+    let workspace = load_workspace_info(&xtask_dir)?;
 
-    let workspace_members: Vec<&Package> = metadata
-        .workspace_members
+    let workspace_members: Vec<&PackageInfo> = workspace
+        .packages
         .iter()
-        .filter_map(|id| metadata.packages.iter().find(|p| p.id == *id))
         .filter(|pkg| {
             // Filter out xtask itself
             pkg.name != "xtask"
@@ -125,7 +160,7 @@ pub fn run_clippy(args: ClippyArgs) -> Result<()> {
         .filter(|pkg| {
             // Apply package filter
             if let Some(ref filter) = package_filter {
-                filter.contains(&pkg.name.to_string())
+                filter.contains(&pkg.name)
             } else {
                 true
             }
@@ -141,10 +176,8 @@ pub fn run_clippy(args: ClippyArgs) -> Result<()> {
         println!("  - {} ({})", pkg.name.bold(), pkg.version);
     }
 
-    let mut stats = ClippyStats::default();
-    let mut has_errors = false;
-
-    // Iterate through all targets
+    // Plan all checks up front, grouped by target
+    let mut groups: Vec<Vec<ClippyCheck>> = Vec::new();
     for target in TARGETS {
         // Apply target filter
         if let Some(ref filter) = target_filter
@@ -153,151 +186,291 @@ pub fn run_clippy(args: ClippyArgs) -> Result<()> {
             continue;
         }
 
-        println!(
-            "\n{}",
-            format!("🎯 Checking target: {target}").bold().yellow()
-        );
-
-        // Iterate through all workspace packages
+        let mut checks = Vec::new();
         for package in &workspace_members {
-            println!("\n📦 Checking package: {}", package.name.bold());
-
-            // Get all features of the package
-            let features = get_package_features(package);
+            let features = &package.features;
 
             if features.is_empty() {
                 // If no features, perform basic check
-                println!("  🔧 No additional features, performing basic check...");
-
-                if args.dry_run {
-                    let fix_str = if args.fix { " --fix" } else { "" };
-                    let allow_dirty_str = if args.fix && args.allow_dirty {
-                        " --allow-dirty"
-                    } else {
-                        ""
-                    };
-                    println!(
-                        "    [DRY RUN] cargo clippy --target {} -p {}{}{}",
-                        target, package.name, fix_str, allow_dirty_str
-                    );
-                    stats.record_skipped();
-                } else {
-                    match run_single_clippy(
+                checks.push(ClippyCheck {
+                    target,
+                    package: &package.name,
+                    features: vec![],
+                    description: "no additional features".to_string(),
+                });
+            } else {
+                // Check each feature individually
+                for feature in features {
+                    checks.push(ClippyCheck {
                         target,
-                        package.name.as_ref(),
-                        &[],
-                        args.continue_on_error,
-                        args.fix,
-                        args.allow_dirty,
-                    ) {
-                        Ok(_) => {
-                            stats.record_passed();
-                        }
-                        Err(e) => {
-                            stats.record_failed();
-                            eprintln!("    {}", format!("❌ Error: {e}").red());
-                            if !args.continue_on_error {
-                                return Err(e);
-                            }
-                            has_errors = true;
-                        }
-                    }
+                        package: &package.name,
+                        features: vec![feature.clone()],
+                        description: format!("feature {}", feature.cyan()),
+                    });
                 }
-            } else {
-                // Iterate through each feature for individual checks
-                for feature in &features {
-                    println!("  🔧 Checking feature: {}", feature.cyan());
-
-                    if args.dry_run {
-                        let fix_str = if args.fix { " --fix" } else { "" };
-                        let allow_dirty_str = if args.fix && args.allow_dirty {
-                            " --allow-dirty"
+
+                // Also check all features enabled together
+                checks.push(ClippyCheck {
+                    target,
+                    package: &package.name,
+                    features: features.clone(),
+                    description: "all features together".to_string(),
+                });
+            }
+        }
+        groups.push(checks);
+    }
+
+    let mut stats = ClippyStats::default();
+
+    if args.dry_run {
+        for check in groups.iter().flatten() {
+            println!(
+                "[DRY RUN] cargo {}",
+                shell_join(clippy_args(check, args.fix, args.allow_dirty))
+            );
+            stats.record_skipped();
+        }
+        stats.print_summary(start_time.elapsed());
+        return Ok(());
+    }
+
+    // Each target is checked by its own cargo process, so targets can be
+    // linted concurrently. Checks within a target stay sequential since they
+    // share the same build directory. `--fix` rewrites the shared source
+    // files, so fixing always runs one check at a time.
+    let cpus = thread::available_parallelism().map_or(1, |n| n.get());
+    let workers = if args.fix {
+        1
+    } else {
+        args.jobs.unwrap_or(cpus).clamp(1, groups.len().max(1))
+    };
+    // Parallel cargo processes block on each other's build directory lock,
+    // so every target gets its own directory, and the CPUs are split among
+    // parallel workers. The directory does not depend on the number of
+    // workers, so sequential and parallel runs share their builds.
+    //
+    // The environment is built once here and shared by every invocation, so
+    // all checks of a run see exactly the same settings.
+    let mut envs: Vec<(&str, OsString)> = vec![
+        // Set environment variable for stricter checking
+        ("RUSTFLAGS", "-D warnings".into()),
+    ];
+    if workers > 1 {
+        println!(
+            "Checking {} targets with {workers} parallel jobs",
+            groups.len()
+        );
+        if std::env::var_os("CARGO_BUILD_JOBS").is_none() {
+            let jobs = (cpus / workers).max(1);
+            envs.push(("CARGO_BUILD_JOBS", jobs.to_string().into()));
+        }
+    }
+    let target_dir = workspace.target_directory.join("clippy");
+
+    // Checks that already passed for the same sources and command line are
+    // skipped. Results are only reused for a clean working tree, and never
+    // when fixing, since fixes depend on more than the committed sources.
+    let fingerprint = if args.no_cache || args.fix {
+        None
+    } else {
+        source_fingerprint()
+    };
+    let stamp_dir = xtask_dir.join("clippy");
+
+    let queue = Mutex::new(groups.into_iter());
+    let shared_stats = Mutex::new(stats);
+    let first_error = Mutex::new(None);
+    let has_errors = AtomicBool::new(false);
+    let abort = AtomicBool::new(false);
+
+    thread::scope(|s| {
+        for _ in 0..workers {
+            s.spawn(|| {
+                loop {
+                    let Some(checks) = queue.lock().unwrap().next() else {
+                        break;
+                    };
+                    let mut envs = envs.clone();
+                    if let Some(check) = checks.first() {
+                        envs.push(("CARGO_TARGET_DIR", target_dir.join(check.target).into()));
+                    }
+                    for check in checks {
+                        if abort.load(Ordering::Relaxed) {
+                            return;
+                        }
+
+                        // Output of concurrent checks interleaves, so tag
+                        // every line with the target it belongs to.
+                        let prefix = if workers > 1 {
+                            format!("[{}] ", check.target)
                         } else {
-                            ""
+                            String::new()
                         };
                         println!(
-                            "    [DRY RUN] cargo clippy --target {} -p {} --features {}{}{}",
-                            target, package.name, feature, fix_str, allow_dirty_str
+                            "\n{prefix}{} 📦 {} 🔧 {}",
+                            format!("🎯 {}", check.target).bold().yellow(),
+                            check.package.bold(),
+                            check.description
                         );
-                        stats.record_skipped();
-                    } else {
-                        match run_single_clippy(
-                            target,
-                            package.name.as_ref(),
-                            std::slice::from_ref(feature),
-                            args.continue_on_error,
-                            args.fix,
-                            args.allow_dirty,
-                        ) {
+                        let stamp = fingerprint.as_ref().map(|fingerprint| {
+                            let cmd_args = clippy_args(&check, args.fix, args.allow_dirty);
+                            (
+                                stamp_path(&stamp_dir, &check),
+                                stamp_key(fingerprint, &cmd_args),
+                            )
+                        });
+                        if let Some((path, key)) = &stamp
+                            && fs::read_to_string(path).is_ok_and(|stamp| stamp == *key)
+                        {
+                            println!("{prefix}    {}", "⏭️  Skipped (cache hit)".yellow());
+                            shared_stats.lock().unwrap().record_skipped();
+                            continue;
+                        }
+
+                        let result = run_single_clippy(&check, &args, &envs, &prefix);
+                        match result {
                             Ok(_) => {
-                                stats.record_passed();
+                                shared_stats.lock().unwrap().record_passed();
+                                if let Some((path, key)) = &stamp
+                                    && fs::create_dir_all(&stamp_dir).is_ok()
+                                {
+                                    let _ = fs::write(path, key);
+                                }
                             }
                             Err(e) => {
-                                stats.record_failed();
-                                eprintln!("    {}", format!("❌ Error: {e}").red());
+                                shared_stats.lock().unwrap().record_failed();
+                                eprintln!("{prefix}    {}", format!("❌ Error: {e}").red());
+                                has_errors.store(true, Ordering::Relaxed);
                                 if !args.continue_on_error {
-                                    return Err(e);
+                                    abort.store(true, Ordering::Relaxed);
+                                    first_error.lock().unwrap().get_or_insert(e);
+                                    return;
                                 }
-                                has_errors = true;
                             }
                         }
                     }
                 }
-
-                // Also check all features enabled together
-                println!("  🔧 Checking all features together...");
-                if args.dry_run {
-                    let fix_str = if args.fix { " --fix" } else { "" };
-                    let allow_dirty_str = if args.fix && args.allow_dirty {
-                        " --allow-dirty"
-                    } else {
-                        ""
-                    };
-                    println!(
-                        "    [DRY RUN] cargo clippy --target {} -p {} --features {}{}{}",
-                        target,
-                        package.name,
-                        features.join(","),
-                        fix_str,
-                        allow_dirty_str
-                    );
-                    stats.record_skipped();
-                } else {
-                    match run_single_clippy(
-                        target,
-                        package.name.as_ref(),
-                        &features,
-                        args.continue_on_error,
-                        args.fix,
-                        args.allow_dirty,
-                    ) {
-                        Ok(_) => {
-                            stats.record_passed();
-                        }
-                        Err(e) => {
-                            stats.record_failed();
-                            eprintln!("    {}", format!("❌ Error: {e}").red());
-                            if !args.continue_on_error {
-                                return Err(e);
-                            }
-                            has_errors = true;
-                        }
-                    }
-                }
-            }
+            });
         }
-    }
+    });
 
     let duration = start_time.elapsed();
-    stats.print_summary(duration);
+    shared_stats.into_inner().unwrap().print_summary(duration);
 
-    if has_errors {
+    if let Some(e) = first_error.into_inner().unwrap() {
+        return Err(e);
+    }
+    if has_errors.load(Ordering::Relaxed) {
         Err(anyhow!("Clippy checks found errors"))
     } else {
         Ok(())
     }
 }
 
+/// Directory holding the state xtask keeps between runs: the workspace
+/// cache and the clippy stamps.
+///
+/// This has to be known before `cargo metadata` runs, so it only follows the
+/// target directory environment variables, not cargo config files.
+fn xtask_dir() -> PathBuf {
+    std::env::var_os("CARGO_TARGET_DIR")
+        .or_else(|| std::env::var_os("CARGO_BUILD_TARGET_DIR"))
+        .map_or_else(|| project_root().join("target"), PathBuf::from)
+        .join("xtask")
+}
+
+/// Key of the cached workspace information: the modification time and size
+/// of the root `Cargo.toml`, plus everything that can move cargo's target
+/// directory (the environment and the cargo config files cargo reads).
+fn workspace_key() -> Result<String> {
+    let manifest =
+        fs::metadata(project_root().join("Cargo.toml")).context("Failed to stat Cargo.toml")?;
+    let mtime = manifest
+        .modified()?
+        .duration_since(UNIX_EPOCH)
+        .map_or(0, |d| d.as_nanos());
+
+    let mut hasher = Sha256::new();
+    hasher.update(format!("{mtime} {}\0", manifest.len()));
+    for var in ["CARGO_TARGET_DIR", "CARGO_BUILD_TARGET_DIR", "CARGO_HOME"] {
+        if let Some(value) = std::env::var_os(var) {
+            hasher.update(var);
+            hasher.update(value.as_encoded_bytes());
+        }
+        hasher.update([0]);
+    }
+    let cargo_home = std::env::var_os("CARGO_HOME").map(PathBuf::from);
+    let config_dirs = project_root()
+        .ancestors()
+        .map(|dir| dir.join(".cargo"))
+        .chain(cargo_home);
+    for dir in config_dirs {
+        for name in ["config.toml", "config"] {
+            let path = dir.join(name);
+            if let Ok(data) = fs::read(&path) {
+                hasher.update(path.as_os_str().as_encoded_bytes());
+                hasher.update(&data);
+            }
+        }
+    }
+    Ok(format!("{:x}", hasher.finalize()))
+}
+
+/// Load workspace packages and their features, reusing the cached result of
+/// a previous run as long as its [`workspace_key`] is unchanged.
+fn load_workspace_info(xtask_dir: &Path) -> Result<WorkspaceInfo> {
+    let manifest_path = project_root().join("Cargo.toml");
+    let key = workspace_key()?;
+
+    let cache_path = xtask_dir.join(WORKSPACE_CACHE_FILE);
+    if let Ok(data) = fs::read(&cache_path)
+        && let Ok(info) = serde_json::from_slice::<WorkspaceInfo>(&data)
+        && info.key == key
+    {
+        return Ok(info);
+    }
+
+    // Get workspace metadata. Run from the project root so cargo reads the config files hashed into
+    // the key, whatever the current directory is.
+    let metadata = MetadataCommand::new()
+        .manifest_path(manifest_path)
+        .current_dir(project_root())
+        .no_deps()
+        .exec()
+        .context("Failed to get workspace metadata")?;
+
+    let packages = metadata
+        .workspace_members
+        .iter()
+        .filter_map(|id| metadata.packages.iter().find(|p| p.id == *id))
+        .map(|pkg| PackageInfo {
+            name: pkg.name.to_string(),
+            version: pkg.version.to_string(),
+            features: get_package_features(pkg),
+        })
+        .collect();
+    let info = WorkspaceInfo {
+        key,
+        target_directory: metadata.target_directory.into_std_path_buf(),
+        packages,
+    };
+
+    // The cache is only an optimization, so failing to write it is not fatal.
+    // Write to a temporary file first so that a concurrent run never reads a
+    // partially written cache.
+    if let Some(dir) = cache_path.parent()
+        && fs::create_dir_all(dir).is_ok()
+    {
+        let tmp_path = cache_path.with_extension("json.tmp");
+        if fs::write(&tmp_path, serde_json::to_vec(&info)?).is_ok() {
+            let _ = fs::rename(&tmp_path, &cache_path);
+        }
+    }
+
+    Ok(info)
+}
+
 /// Get all features of a package
 fn get_package_features(package: &Package) -> Vec<String> {
     let mut features = Vec::new();
@@ -314,21 +487,17 @@ fn get_package_features(package: &Package) -> Vec<String> {
     features
 }
 
-/// Run a single clippy check
-fn run_single_clippy(
-    target: &str,
-    package: &str,
-    features: &[String],
-    continue_on_error: bool,
-    fix: bool,
-    allow_dirty: bool,
-) -> Result<()> {
+/// Build the `cargo` arguments for a clippy check.
+///
+/// This is the single source of the command line, used both for running the
+/// check and for displaying it (including in dry-run mode).
+fn clippy_args(check: &ClippyCheck, fix: bool, allow_dirty: bool) -> Vec<String> {
     let mut args = vec![
         "clippy".to_string(),
         "--target".to_string(),
-        target.to_string(),
+        check.target.to_string(),
         "-p".to_string(),
-        package.to_string(),
+        check.package.to_string(),
         "--all-targets".to_string(),
     ];
 
@@ -343,9 +512,9 @@ fn run_single_clippy(
     }
 
     // Add features parameter
-    if !features.is_empty() {
+    if !check.features.is_empty() {
         args.push("--features".to_string());
-        args.push(features.join(","));
+        args.push(check.features.join(","));
     }
 
     // Add clippy options
@@ -353,72 +522,191 @@ fn run_single_clippy(
     args.push("-D".to_string()); // Treat all warnings as errors
     args.push("warnings".to_string());
 
+    args
+}
+
+/// Run a single clippy check.
+///
+/// The compiler output is streamed to stderr while the check runs, with every
+/// line prefixed by `prefix`, and is also kept to look for diagnostics.
+fn run_single_clippy(
+    check: &ClippyCheck,
+    options: &ClippyArgs,
+    envs: &[(&str, OsString)],
+    prefix: &str,
+) -> Result<()> {
+    let ClippyCheck {
+        target,
+        package,
+        features,
+        ..
+    } = check;
+
+    let args = clippy_args(check, options.fix, options.allow_dirty);
     let mut cmd = Command::new("cargo");
     cmd.args(&args);
+    cmd.envs(envs.iter().map(|(key, value)| (key, value)));
 
-    // Set environment variable for stricter checking
-    cmd.env("RUSTFLAGS", "-D warnings");
-
-    let fix_str = if fix { " --fix" } else { "" };
-    let allow_dirty_str = if fix && allow_dirty {
-        " --allow-dirty"
-    } else {
-        ""
-    };
     println!(
-        "    Executing: {}",
-        format!(
-            "cargo clippy --target {} -p {}{}{}{}",
-            target,
-            package,
-            if features.is_empty() {
-                String::new()
-            } else {
-                format!(" --features {}", features.join(","))
-            },
-            fix_str,
-            allow_dirty_str
-        )
-        .dimmed()
+        "{prefix}    Executing: {}",
+        format!("cargo {}", shell_join(&args)).dimmed()
     );
 
-    let output = cmd.output().context(format!(
-        "Failed to execute cargo clippy: target={target}, package={package}, features={features:?}"
-    ))?;
+    let mut child = cmd
+        .stdout(Stdio::piped())
+        .stderr(Stdio::piped())
+        .spawn()
+        .context(format!(
+            "Failed to execute cargo clippy: target={target}, package={package}, features={features:?}"
+        ))?;
+
+    let child_stderr = child.stderr.take().unwrap();
+    let stderr_prefix = prefix.to_string();
+    let tee = thread::spawn(move || {
+        let mut captured = String::new();
+        for line in BufReader::new(child_stderr).split(b'\n') {
+            let Ok(line) = line else { break };
+            let line = String::from_utf8_lossy(&line);
+            eprintln!("{stderr_prefix}{line}");
+            captured.push_str(&line);
+            captured.push('\n');
+        }
+        captured
+    });
 
-    if output.status.success() {
+    let mut stdout = Vec::new();
+    child.stdout.take().unwrap().read_to_end(&mut stdout)?;
+    let status = child.wait()?;
+    let stderr = tee.join().unwrap();
+
+    if status.success() {
         // Even if successful, check if there's output (sometimes clippy has warnings but still returns success)
-        if !output.stderr.is_empty() {
-            let stderr = String::from_utf8_lossy(&output.stderr);
-            if stderr.contains("warning:") || stderr.contains("error:") {
-                return Err(anyhow!("Clippy output warnings or errors:\n{stderr}"));
-            }
+        if stderr.contains("warning:") || stderr.contains("error:") {
+            return Err(anyhow!("Clippy output warnings or errors, see above"));
         }
-        println!("    {}", "✅ Passed".green());
+        println!("{prefix}    {}", "✅ Passed".green());
         Ok(())
     } else {
-        let stderr = String::from_utf8_lossy(&output.stderr);
-        let stdout = String::from_utf8_lossy(&output.stdout);
+        // stderr has already been shown while the check was running
+        let stdout = String::from_utf8_lossy(&stdout);
 
-        let error_msg = if !stderr.is_empty() {
-            stderr.to_string()
-        } else if !stdout.is_empty() {
+        let error_msg = if !stdout.is_empty() {
             stdout.to_string()
         } else {
             format!(
                 "clippy check failed, exit code: {}",
-                output.status.code().unwrap_or(-1)
+                status.code().unwrap_or(-1)
             )
         };
 
-        if continue_on_error {
-            eprintln!(
-                "    {}",
-                format!("⚠️  Error (continuing):\n{error_msg}").yellow()
-            );
-            Ok(())
-        } else {
-            Err(anyhow!("Clippy check failed:\n{error_msg}"))
+        Err(anyhow!("Clippy check failed:\n{error_msg}"))
+    }
+}
+
+/// Fingerprint of everything a clippy check depends on besides its command
+/// line: the committed source tree, `Cargo.lock` and the Rust toolchain.
+///
+/// Returns `None` if the working tree has uncommitted changes or untracked
+/// files that are not ignored (cargo discovers new binaries, examples and
+/// tests on its own), or if git or rustc is unavailable. Also returns `None`
+/// if `AXVISOR_VM_CONFIGS` is set: `build.rs` then compiles in the named
+/// config files and the guest images they reference, which live outside the
+/// tree and cannot be fingerprinted reliably.
+fn source_fingerprint() -> Option<String> {
+    if std::env::var_os("AXVISOR_VM_CONFIGS").is_some() {
+        return None;
+    }
+
+    let output = |program: &OsStr, args: &[&str]| {
+        let output = Command::new(program)
+            .current_dir(project_root())
+            .args(args)
+            .output()
+            .ok()?;
+        output.status.success().then_some(output.stdout)
+    };
+    let git = |args: &[&str]| output(OsStr::new("git"), args);
+
+    if !git(&["status", "--porcelain"])?.is_empty() {
+        return None;
+    }
+    let tree = git(&["rev-parse", "HEAD^{tree}"])?;
+    // Run from the project root, so that `rust-toolchain.toml` and
+    // `RUSTUP_TOOLCHAIN` select the same compiler cargo will use.
+    let rustc = std::env::var_os("RUSTC").unwrap_or_else(|| "rustc".into());
+    let toolchain = output(&rustc, &["-vV"])?;
+
+    let mut hasher = Sha256::new();
+    hasher.update(&tree);
+    hasher.update(&toolchain);
+    if let Ok(lock) = fs::read(project_root().join("Cargo.lock")) {
+        hasher.update(&lock);
+    }
+    Some(format!("{:x}", hasher.finalize()))
+}
+
+/// Stamp file recording the last successful run of a check.
+fn stamp_path(dir: &Path, check: &ClippyCheck) -> PathBuf {
+    let features = Sha256::digest(check.features.join(","));
+    let features = format!("{features:x}");
+    dir.join(format!(
+        "{}-{}-{}.stamp",
+        check.target,
+        check.package,
+        &features[..16]
+    ))
+}
+
+/// Content of the stamp file for a check run with `args` on `fingerprint`.
+fn stamp_key(fingerprint: &str, args: &[String]) -> String {
+    let mut hasher = Sha256::new();
+    hasher.update(fingerprint);
+    hasher.update(shell_join(args));
+    format!("{:x}", hasher.finalize())
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn check(features: &[&str]) -> ClippyCheck<'static> {
+        ClippyCheck {
+            target: TARGETS[0],
+            package: PACKAGE,
+            features: features.iter().map(|f| f.to_string()).collect(),
+            description: String::new(),
         }
     }
+
+    #[test]
+    fn stamp_path_depends_on_features() {
+        let dir = Path::new("stamps");
+        assert_eq!(
+            stamp_path(dir, &check(&["fs"])),
+            stamp_path(dir, &check(&["fs"]))
+        );
+        assert_ne!(
+            stamp_path(dir, &check(&["fs"])),
+            stamp_path(dir, &check(&[]))
+        );
+        assert_ne!(
+            stamp_path(dir, &check(&["fs"])),
+            stamp_path(dir, &check(&["fs", "ept-level-4"]))
+        );
+    }
+
+    #[test]
+    fn stamp_key_depends_on_inputs() {
+        let args = clippy_args(&check(&["fs"]), false, false);
+        assert_eq!(stamp_key("abc", &args), stamp_key("abc", &args));
+        assert_ne!(stamp_key("abc", &args), stamp_key("abd", &args));
+        assert_ne!(
+            stamp_key("abc", &args),
+            stamp_key("abc", &clippy_args(&check(&["fs"]), true, false))
+        );
+        assert_ne!(
+            stamp_key("abc", &args),
+            stamp_key("abc", &clippy_args(&check(&[]), false, false))
+        );
+    }
 }
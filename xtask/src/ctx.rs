@@ -12,10 +12,21 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 
+use std::path::Path;
+
 use ostool::ctx::{AppContext, PathConfig};
 
 use crate::BuildArgs;
 
+/// Returns the root directory of the AxVisor repository.
+///
+/// xtask is a binary of the top-level `axvisor` package, so this is the
+/// directory of the manifest it was built from. It is resolved at compile
+/// time and does not depend on the directory xtask is invoked from.
+pub fn project_root() -> &'static Path {
+    Path::new(env!("CARGO_MANIFEST_DIR"))
+}
+
 pub struct Context {
     pub ctx: AppContext,
     pub build_config_path: Option<std::path::PathBuf>,
@@ -24,7 +35,7 @@ pub struct Context {
 
 impl Context {
     pub fn new() -> Self {
-        let workdir = std::env::current_dir().expect("Failed to get current working directory");
+        let workdir = project_root().to_path_buf();
 
         let ctx = AppContext {
             paths: PathConfig {
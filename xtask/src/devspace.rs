@@ -21,6 +21,9 @@ use anyhow::{Context, Result, anyhow};
 use cargo_metadata::{Metadata, MetadataCommand, Package};
 use serde::{Deserialize, Serialize};
 
+use crate::ctx::project_root;
+use crate::process::shell_join;
+
 const STATE_DIR: &str = ".devspace";
 const STATE_FILE: &str = ".devspace/state.json";
 const PATCH_BEGIN_MARKER: &str = "# >>> devspace patches >>>";
@@ -43,13 +46,17 @@ const DEVSPACE_REPO_OVERRIDES: &[(&str, &str)] = &[(
 
 pub fn start() -> Result<()> {
     let metadata = MetadataCommand::new()
+        .manifest_path(project_root().join("Cargo.toml"))
         .exec()
         .context("Failed to run cargo metadata")?;
     let repos = resolve_dev_repos(&metadata)?;
 
     let mut state = load_state()?;
-    ensure_submodules(&mut state, &repos)?;
+    let result = ensure_submodules(&mut state, &repos);
+    // Record the modules added so far even if a later step failed, so that
+    // `devspace stop` can still remove them.
     save_state(&state)?;
+    result?;
 
     let specs = compute_patch_specs(&metadata, &repos)?;
     apply_patches(&specs)?;
@@ -86,38 +93,77 @@ pub fn stop() -> Result<()> {
 }
 
 fn ensure_submodules(state: &mut DevspaceState, repos: &[DevRepo]) -> Result<()> {
+    let mut pending = Vec::new();
     for repo in repos {
-        let dest_path = Path::new(&repo.dest);
-        if dest_path.exists() {
+        let dest_path = project_root().join(&repo.dest);
+        // A checked out submodule always has a `.git` file; a directory without
+        // one is left over from an interrupted clone and must be cloned again.
+        if dest_path.join(".git").exists() {
+            // Added by an earlier run whose initialization failed
+            if state
+                .modules
+                .get(&repo.name)
+                .is_some_and(|module| module.path == repo.dest && module.pending_init)
+            {
+                pending.push(repo);
+            }
             continue;
         }
+        if dest_path.exists() {
+            let is_empty = fs::read_dir(&dest_path)
+                .with_context(|| format!("Failed to read {}", repo.dest))?
+                .next()
+                .is_none();
+            if !is_empty {
+                return Err(anyhow!(
+                    "{} exists but is not a git checkout; remove it and retry",
+                    repo.dest
+                ));
+            }
+            println!("Removing incomplete checkout {}", repo.dest);
+            fs::remove_dir(&dest_path)
+                .with_context(|| format!("Failed to remove {}", repo.dest))?;
+        }
 
         println!("Adding submodule {} -> {}", repo.git_url, repo.dest);
+        // Only the tip is needed to build against a local checkout; run
+        // `git fetch --unshallow` inside the module if full history is wanted.
         run_git(&[
             "submodule",
             "add",
             "--force",
+            "--depth",
+            "1",
             repo.git_url.as_str(),
             repo.dest.as_str(),
         ])?;
-        run_git(&[
-            "submodule",
-            "update",
-            "--init",
-            "--recursive",
-            repo.dest.as_str(),
-        ])?;
         match state.modules.entry(repo.name.clone()) {
             Entry::Occupied(mut entry) => {
-                entry.get_mut().path = repo.dest.clone();
+                let module = entry.get_mut();
+                module.path = repo.dest.clone();
+                module.pending_init = true;
             }
             Entry::Vacant(entry) => {
                 entry.insert(ManagedModule {
                     name: repo.name.clone(),
                     path: repo.dest.clone(),
+                    pending_init: true,
                 });
             }
         }
+        pending.push(repo);
+    }
+
+    // Initialize all new submodules with a single git invocation
+    if !pending.is_empty() {
+        let mut args = vec!["submodule", "update", "--init", "--recursive", "--"];
+        args.extend(pending.iter().map(|repo| repo.dest.as_str()));
+        run_git(&args)?;
+        for repo in pending {
+            if let Some(module) = state.modules.get_mut(&repo.name) {
+                module.pending_init = false;
+            }
+        }
     }
 
     Ok(())
@@ -128,15 +174,17 @@ fn remove_submodules(modules: &HashMap<String, ManagedModule>) -> Result<()> {
         println!("Removing submodule {}", module.path);
         let path = module.path.as_str();
         let _ = run_git(&["submodule", "deinit", "-f", "--", path]);
-        let git_modules_dir = Path::new(".git/modules").join(path);
+        let git_modules_dir = project_root().join(".git/modules").join(path);
         if git_modules_dir.exists() {
             fs::remove_dir_all(&git_modules_dir)
                 .with_context(|| format!("Failed to remove {git_modules_dir:?}"))?;
         }
-        if Path::new(path).exists() {
+        let module_dir = project_root().join(path);
+        if module_dir.exists() {
             let _ = run_git(&["rm", "-f", "--", path]);
-            if Path::new(path).exists() {
-                fs::remove_dir_all(path).with_context(|| format!("Failed to remove {path}"))?;
+            if module_dir.exists() {
+                fs::remove_dir_all(&module_dir)
+                    .with_context(|| format!("Failed to remove {path}"))?;
             }
         }
     }
@@ -190,9 +238,9 @@ fn apply_patches(specs: &[PatchSpec]) -> Result<()> {
         return Ok(());
     }
 
-    let config_path = Path::new(".cargo/config.toml");
+    let config_path = project_root().join(".cargo/config.toml");
     let mut contents = if config_path.exists() {
-        fs::read_to_string(config_path)
+        fs::read_to_string(&config_path)
             .with_context(|| format!("Failed to read {config_path:?}"))?
     } else {
         String::new()
@@ -213,43 +261,45 @@ fn apply_patches(specs: &[PatchSpec]) -> Result<()> {
         contents.push('\n');
     }
 
-    fs::write(config_path, contents).with_context(|| format!("Failed to write {config_path:?}"))?;
+    fs::write(&config_path, contents)
+        .with_context(|| format!("Failed to write {config_path:?}"))?;
     Ok(())
 }
 
 fn remove_patches(_: &[PatchRecord]) -> Result<()> {
-    let config_path = Path::new(".cargo/config.toml");
+    let config_path = project_root().join(".cargo/config.toml");
     if !config_path.exists() {
         return Ok(());
     }
 
-    let original = fs::read_to_string(config_path)
+    let original = fs::read_to_string(&config_path)
         .with_context(|| format!("Failed to read {config_path:?}"))?;
     let (cleaned, removed) = strip_devspace_section(&original);
 
     if removed {
-        fs::write(config_path, cleaned)
+        fs::write(&config_path, cleaned)
             .with_context(|| format!("Failed to write {config_path:?}"))?;
     }
     Ok(())
 }
 
 fn load_state() -> Result<DevspaceState> {
-    let path = Path::new(STATE_FILE);
+    let path = project_root().join(STATE_FILE);
     if !path.exists() {
         return Ok(DevspaceState::default());
     }
 
-    let contents = fs::read_to_string(path).with_context(|| format!("Failed to read {path:?}"))?;
+    let contents = fs::read_to_string(&path).with_context(|| format!("Failed to read {path:?}"))?;
     let state =
         serde_json::from_str(&contents).with_context(|| format!("Failed to parse {path:?}"))?;
     Ok(state)
 }
 
 fn save_state(state: &DevspaceState) -> Result<()> {
-    fs::create_dir_all(STATE_DIR).context("Failed to create devspace state dir")?;
+    fs::create_dir_all(project_root().join(STATE_DIR))
+        .context("Failed to create devspace state dir")?;
     let data = serde_json::to_string_pretty(state)?;
-    fs::write(STATE_FILE, data).context("Failed to write devspace state")?;
+    fs::write(project_root().join(STATE_FILE), data).context("Failed to write devspace state")?;
     Ok(())
 }
 
@@ -449,20 +499,16 @@ fn to_unix_path(path: &Path) -> String {
 
 fn run_git(args: &[&str]) -> Result<()> {
     let status = Command::new("git")
-        .current_dir(workspace_root()?)
+        .current_dir(project_root())
         .args(args)
         .status()
-        .with_context(|| format!("Failed to run git {}", args.join(" ")))?;
+        .with_context(|| format!("Failed to run git {}", shell_join(args)))?;
     if !status.success() {
-        return Err(anyhow!("git command failed: git {}", args.join(" ")));
+        return Err(anyhow!("git command failed: git {}", shell_join(args)));
     }
     Ok(())
 }
 
-fn workspace_root() -> Result<PathBuf> {
-    std::env::current_dir().context("Failed to resolve workspace root")
-}
-
 #[derive(Default, Serialize, Deserialize)]
 struct DevspaceState {
     modules: HashMap<String, ManagedModule>,
@@ -473,6 +519,9 @@ struct DevspaceState {
 struct ManagedModule {
     name: String,
     path: String,
+    /// Added, but `git submodule update` has not completed for it yet
+    #[serde(default)]
+    pending_init: bool,
 }
 
 #[derive(Clone, Serialize, Deserialize)]
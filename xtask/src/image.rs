@@ -33,10 +33,7 @@
 //! xtask image rm evm3588_arceos
 //! ```
 
-use std::{
-    fs,
-    path::{Path, PathBuf},
-};
+use std::{fs, path::PathBuf};
 
 use anyhow::{Result, anyhow};
 use clap::{Parser, Subcommand};
@@ -49,6 +46,7 @@ mod registry;
 mod spec;
 mod storage;
 
+use crate::ctx::project_root;
 use config::ImageConfig;
 use spec::ImageSpecRef;
 use storage::Storage;
@@ -150,29 +148,10 @@ pub enum ImageCommands {
     Defconfig,
 }
 
-/// Converts a path to absolute; joins with current dir if relative.
-fn to_absolute_path(path: &Path) -> Result<PathBuf> {
-    Ok(if path.is_absolute() {
-        path.to_path_buf()
-    } else {
-        std::env::current_dir()?.join(path)
-    })
-}
-
-/// Returns the path to the AxVisor repository root (parent of the xtask crate).
-fn get_axvisor_repo_dir() -> Result<PathBuf> {
-    // CARGO_MANIFEST_DIR contains the path of the xtask crate, and we need to
-    // get the parent directory to get the AxVisor repository directory.
-    Ok(Path::new(&std::env::var("CARGO_MANIFEST_DIR")?)
-        .parent()
-        .ok_or_else(|| anyhow!("Failed to determine AxVisor repository directory"))?
-        .to_path_buf())
-}
-
 impl ImageArgs {
     /// Loads image configuration, merging CLI overrides with values from the config file.
     pub async fn get_config(&self) -> Result<ImageConfig> {
-        let mut config = ImageConfig::read_config(&get_axvisor_repo_dir()?)?;
+        let mut config = ImageConfig::read_config(project_root())?;
         self.overrides.apply_on(&mut config);
         Ok(config)
     }
@@ -198,7 +177,7 @@ impl ImageArgs {
                 self.sync_registry().await?;
             }
             ImageCommands::Defconfig => {
-                ImageConfig::reset_config(&get_axvisor_repo_dir()?)?;
+                ImageConfig::reset_config(project_root())?;
             }
         }
 
@@ -240,7 +219,7 @@ impl ImageArgs {
         let output_path = match output_dir {
             Some(dir) => {
                 storage
-                    .download_image_to(spec, &to_absolute_path(Path::new(dir))?)
+                    .download_image_to(spec, &std::path::absolute(dir)?)
                     .await?
             }
             None => storage.download_image(spec).await?,
@@ -27,12 +27,15 @@ use clap::{Args, Parser, Subcommand};
 use std::fs;
 use std::path::{Path, PathBuf};
 
+use crate::ctx::project_root;
+
 mod cargo;
 mod clippy;
 mod ctx;
 mod devspace;
 mod image;
 mod menuconfig;
+mod process;
 mod tbuld;
 mod vmconfig;
 
@@ -55,9 +58,9 @@ enum Commands {
     Build(BuildArgs),
     /// Run clippy checks across all targets and feature combinations
     Clippy(ClippyArgs),
-    /// Run ArceOS in QEMU emulation environment
+    /// Build and run ArceOS in QEMU emulation environment
     Qemu(QemuArgs),
-    /// Run ArceOS with U-Boot bootloader
+    /// Build and run ArceOS with U-Boot bootloader
     Uboot(UbootArgs),
     /// Generate VM configuration schema
     Vmconfig,
@@ -112,6 +115,15 @@ struct ClippyArgs {
     /// Allow fixing when the working directory is dirty (has uncommitted changes)
     #[arg(long)]
     allow_dirty: bool,
+
+    /// Number of targets to check in parallel (defaults to the number of CPUs,
+    /// ignored with --fix)
+    #[arg(short, long)]
+    jobs: Option<usize>,
+
+    /// Run all checks, even those that passed before on the same sources
+    #[arg(long)]
+    no_cache: bool,
 }
 
 #[derive(Parser)]
@@ -154,45 +166,45 @@ enum DevspaceCommand {
     Stop,
 }
 
-#[tokio::main]
-async fn main() -> Result<()> {
+fn main() -> Result<()> {
     let cli = Cli::parse();
 
-    let mut ctx = ctx::Context::new();
-
     match cli.command {
         Commands::Defconfig { board_name } => {
             defconfig_command(&board_name)?;
         }
         Commands::Build(args) => {
             println!("Building the project...");
+            let mut ctx = ctx::Context::new();
             ctx.apply_build_args(&args);
-            ctx.run_build().await?;
+            block_on(ctx.run_build())?;
             println!("Build completed successfully.");
         }
         Commands::Clippy(args) => {
             clippy::run_clippy(args)?;
         }
         Commands::Qemu(args) => {
+            let mut ctx = ctx::Context::new();
             ctx.apply_build_args(&args.build);
-            ctx.vmconfigs = args.vmconfigs;
+            ctx.vmconfigs = resolve_vmconfigs(args.vmconfigs)?;
             ctx.build_config_path = args.build_config;
-            ctx.run_qemu(args.qemu_config).await?;
+            block_on(ctx.run_qemu(args.qemu_config))?;
         }
         Commands::Uboot(args) => {
+            let mut ctx = ctx::Context::new();
             ctx.apply_build_args(&args.build);
-            ctx.vmconfigs = args.vmconfigs;
+            ctx.vmconfigs = resolve_vmconfigs(args.vmconfigs)?;
             ctx.build_config_path = args.build_config;
-            ctx.run_uboot(args.uboot_config).await?;
+            block_on(ctx.run_uboot(args.uboot_config))?;
         }
         Commands::Vmconfig => {
-            ctx.run_vmconfig().await?;
+            block_on(ctx::Context::new().run_vmconfig())?;
         }
         Commands::Menuconfig => {
-            ctx.run_menuconfig().await?;
+            block_on(ctx::Context::new().run_menuconfig())?;
         }
         Commands::Image(args) => {
-            image::run_image(args).await?;
+            block_on(image::run_image(args))?;
         }
         Commands::Devspace(args) => match args.action {
             DevspaceCommand::Start => devspace::start()?,
@@ -203,50 +215,90 @@ async fn main() -> Result<()> {
     Ok(())
 }
 
+/// Runs `future` to completion on a Tokio runtime.
+///
+/// The runtime is only started for commands that need async I/O; `defconfig`,
+/// `clippy` and `devspace` run without spawning its worker threads.
+fn block_on<F: Future>(future: F) -> F::Output {
+    tokio::runtime::Builder::new_multi_thread()
+        .enable_all()
+        .build()
+        .expect("Failed to build the Tokio runtime")
+        .block_on(future)
+}
+
 fn defconfig_command(board_name: &str) -> Result<()> {
     println!("Setting default configuration for board: {board_name}");
 
     // Validate board configuration exists
-    let board_config_path = format!("configs/board/{board_name}.toml");
-    if !Path::new(&board_config_path).exists() {
+    let board_config_path = project_root()
+        .join("configs/board")
+        .join(format!("{board_name}.toml"));
+    if !board_config_path.exists() {
         return Err(anyhow!(
             "Board configuration '{board_name}' not found. Available boards: qemu-aarch64, orangepi-5-plus"
         ));
     }
 
+    let build_config_path = project_root().join(".build.toml");
+
     // Backup existing .build.toml if it exists
-    backup_existing_config()?;
+    backup_existing_config(&build_config_path)?;
 
     // Copy board configuration to .build.toml
-    copy_board_config(board_name)?;
+    copy_board_config(&board_config_path, &build_config_path)?;
 
     println!("Successfully set default configuration to: {board_name}");
     Ok(())
 }
 
-fn backup_existing_config() -> Result<()> {
-    let build_config_path = ".build.toml";
+/// Resolve `--vmconfigs` paths against the current directory, like the other
+/// config file options. Only `vm_configs` listed in `.build.toml` are relative
+/// to the project root.
+fn resolve_vmconfigs(paths: Vec<String>) -> Result<Vec<String>> {
+    paths
+        .into_iter()
+        .map(|path| {
+            let path = std::path::absolute(&path)
+                .with_context(|| format!("Failed to resolve VM config path {path}"))?;
+            Ok(path.to_string_lossy().into_owned())
+        })
+        .collect()
+}
 
-    if Path::new(build_config_path).exists() {
+fn backup_existing_config(build_config_path: &Path) -> Result<()> {
+    if build_config_path.exists() {
         let timestamp = Utc::now().format("%Y%m%d_%H%M%S");
-        let backup_path = format!("{build_config_path}.backup_{timestamp}");
-
-        fs::copy(build_config_path, &backup_path)
-            .with_context(|| format!("Failed to backup {build_config_path} to {backup_path}"))?;
-
-        println!("Backed up existing configuration to: {backup_path}");
+        let mut backup_path = build_config_path.as_os_str().to_owned();
+        backup_path.push(format!(".backup_{timestamp}"));
+        let backup_path = PathBuf::from(backup_path);
+
+        fs::copy(build_config_path, &backup_path).with_context(|| {
+            format!(
+                "Failed to backup {} to {}",
+                build_config_path.display(),
+                backup_path.display()
+            )
+        })?;
+
+        println!(
+            "Backed up existing configuration to: {}",
+            backup_path.display()
+        );
     }
 
     Ok(())
 }
 
-fn copy_board_config(board_name: &str) -> Result<()> {
-    let source_path = format!("configs/board/{board_name}.toml");
-    let target_path = ".build.toml";
-
-    fs::copy(&source_path, target_path)
-        .with_context(|| format!("Failed to copy {source_path} to {target_path}"))?;
+fn copy_board_config(source_path: &Path, target_path: &Path) -> Result<()> {
+    fs::copy(source_path, target_path).with_context(|| {
+        format!(
+            "Failed to copy {} to {}",
+            source_path.display(),
+            target_path.display()
+        )
+    })?;
 
-    println!("Copied board configuration from: {source_path}");
+    println!("Copied board configuration from: {}", source_path.display());
     Ok(())
 }
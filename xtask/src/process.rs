@@ -0,0 +1,72 @@
+// Copyright 2025 The Axvisor Team
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+//! Helpers for running external commands.
+//!
+//! Commands are always spawned directly from an argument vector, never through
+//! a shell. The helpers here only produce a printable form for logging.
+
+/// Quotes a single argument so that a POSIX shell reads it back verbatim.
+///
+/// Arguments made only of safe characters are returned unchanged.
+pub fn shell_quote(arg: &str) -> String {
+    let is_safe = |c: char| c.is_ascii_alphanumeric() || "@%+=:,./-_".contains(c);
+    if !arg.is_empty() && arg.chars().all(is_safe) {
+        arg.to_string()
+    } else {
+        format!("'{}'", arg.replace('\'', r#"'"'"'"#))
+    }
+}
+
+/// Joins a command line into a single string that can be copied into a shell.
+///
+/// # Arguments
+///
+/// * `args` - Program followed by its arguments
+pub fn shell_join<I, S>(args: I) -> String
+where
+    I: IntoIterator<Item = S>,
+    S: AsRef<str>,
+{
+    args.into_iter()
+        .map(|arg| shell_quote(arg.as_ref()))
+        .collect::<Vec<_>>()
+        .join(" ")
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn quote_safe() {
+        assert_eq!(shell_quote("--features"), "--features");
+        assert_eq!(shell_quote("fs,ept-level-4"), "fs,ept-level-4");
+    }
+
+    #[test]
+    fn quote_unsafe() {
+        assert_eq!(shell_quote(""), "''");
+        assert_eq!(shell_quote("a b"), "'a b'");
+        assert_eq!(shell_quote("it's"), r#"'it'"'"'s'"#);
+    }
+
+    #[test]
+    fn join() {
+        assert_eq!(
+            shell_join(["git", "rm", "-f", "--", "my dir"]),
+            "git rm -f -- 'my dir'"
+        );
+    }
+}
@@ -46,11 +46,14 @@ impl Context {
             config_path = c.clone();
         }
 
-        std::fs::write(
-            config_path.parent().unwrap().join(".build-schema.json"),
-            serde_json::to_string_pretty(&json).unwrap(),
-        )
-        .with_context(|| "Failed to write schema file .build-schema.json")?;
+        // The schema only changes together with xtask itself, so leave an
+        // up-to-date file untouched instead of rewriting it on every build.
+        let schema_path = config_path.parent().unwrap().join(".build-schema.json");
+        let schema = serde_json::to_string_pretty(&json).unwrap();
+        if std::fs::read_to_string(&schema_path).ok().as_deref() != Some(schema.as_str()) {
+            std::fs::write(&schema_path, schema)
+                .with_context(|| "Failed to write schema file .build-schema.json")?;
+        }
 
         let config_str = std::fs::read_to_string(&config_path)
             .with_context(|| format!("Failed to read config file: {}", config_path.display()))?;